@@ -1,14 +1,30 @@
 #!/usr/bin/env python3
 import os
+import pathlib
+import atexit
+import asyncio
 import time
 import json
+import hashlib
+import itertools
+import queue
 import random
+import signal
+import sys
 import threading
+from collections import deque
 from datetime import datetime
 from typing import Optional
 
+import httpx
 import requests
-from flask import Flask, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import JSONProvider
+from pybloom_live import ScalableBloomFilter
+from waitress import serve
 
 # ---------- CONFIG (Environment Variables) ----------
 # Required:
@@ -60,22 +76,137 @@ if GOOGLE_CREDS:
 else:
     print("Google Sheets not configured (GOOGLE_CREDS env missing).")
 
+# ---------- Google Sheets batch writers (one queue + flusher per worksheet) ----------
+SHEET_FLUSH_INTERVAL = 30  # seconds between append_rows calls
+SHEET_MAX_ATTEMPTS = 5
+SHEET_QUEUES = {name: queue.SimpleQueue() for name in ("trovati", "comprati", "rivenduti")}
+_sheet_retry = {name: [] for name in SHEET_QUEUES}  # failed batch per tab, sent first next flush
+_sheet_flush_locks = {name: threading.Lock() for name in SHEET_QUEUES}
+
+def flush_sheet_queue(name: str):
+    if not sheet:
+        return
+    # the writer thread and the atexit flush may overlap; keep each tab's flushes serial
+    with _sheet_flush_locks[name]:
+        q = SHEET_QUEUES[name]
+        rows = _sheet_retry[name]
+        _sheet_retry[name] = []
+        while True:
+            try:
+                rows.append(q.get_nowait())
+            except queue.Empty:
+                break
+        if not rows:
+            return
+        for attempt in range(SHEET_MAX_ATTEMPTS):
+            try:
+                sheet[name].append_rows(rows, value_input_option="RAW")
+                return
+            except Exception as e:
+                print(f"Error writing to sheet {name}:", e)
+                if attempt < SHEET_MAX_ATTEMPTS - 1:
+                    time.sleep(2 ** attempt)
+        # give up for now, keep the rows (in order) ahead of anything queued since
+        _sheet_retry[name] = rows
+
+def sheet_writer_loop(name: str):
+    while True:
+        time.sleep(SHEET_FLUSH_INTERVAL)
+        flush_sheet_queue(name)
+
+def flush_all_sheets():
+    for name in SHEET_QUEUES:
+        flush_sheet_queue(name)
+
+atexit.register(flush_all_sheets)
+
 # ---------- Basic settings ----------
-SEEN_FILE = "seen_items.txt"
-seen_hashes = set()
-recent_items = []  # small memory store for dashboard: list of dicts
+SEEN_FILE = "seen.bin"  # append-only journal of 8-byte hashes added since the last snapshot
+SEEN_RECORD_SIZE = 8
+SEEN_BLOOM_FILE = "seen.bloom"  # periodic snapshot of the Bloom filter
+SEEN_SNAPSHOT_EVERY = 500  # inserts between snapshots
 MAX_RECENT = 200
+recent_items = deque(maxlen=MAX_RECENT)  # small memory store for dashboard: newest first
+recent_by_id = {}  # id -> record, mirrors recent_items for O(1) lookups
 
-# load seen items at startup
+# load seen items at startup: snapshot first, then replay the journal on top of it
+seen_bloom = None
+if os.path.exists(SEEN_BLOOM_FILE):
+    try:
+        with open(SEEN_BLOOM_FILE, "rb") as f:
+            seen_bloom = ScalableBloomFilter.fromfile(f)
+    except Exception as e:
+        print("Could not read seen.bloom:", e)
+if seen_bloom is None:
+    seen_bloom = ScalableBloomFilter(initial_capacity=1_000_000, error_rate=1e-7)
 if os.path.exists(SEEN_FILE):
     try:
-        with open(SEEN_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                h = line.strip()
-                if h:
-                    seen_hashes.add(h)
+        raw = pathlib.Path(SEEN_FILE).read_bytes()
+        # drop a partial trailing record left by an interrupted write, so that
+        # records appended from now on stay aligned
+        whole = len(raw) - len(raw) % SEEN_RECORD_SIZE
+        if whole != len(raw):
+            os.truncate(SEEN_FILE, whole)
+        for i in range(0, whole, SEEN_RECORD_SIZE):
+            seen_bloom.add(raw[i:i + SEEN_RECORD_SIZE].hex())
     except Exception as e:
-        print("Could not read seen_items.txt:", e)
+        print("Could not read seen.bin:", e)
+_inserts_since_snapshot = 0
+_inflight = set()  # hashes queued for Telegram but not delivered yet, not in seen_bloom
+_seen_lock = threading.RLock()  # seen_bloom is written by the telegram worker, read by snapshots
+_pending_hashes = deque()  # new hashes waiting to be appended to the journal
+_seen_file_lock = threading.Lock()
+SEEN_FLUSH_INTERVAL = 2  # seconds between journal flushes
+
+def flush_pending():
+    # drain whatever is queued and append it in a single write
+    drained = []
+    while _pending_hashes:
+        drained.append(_pending_hashes.popleft())
+    if not drained:
+        return
+    try:
+        with _seen_file_lock, open(SEEN_FILE, "ab") as f:
+            f.write(b"".join(bytes.fromhex(h) for h in drained))
+    except Exception as e:
+        print("Could not write seen file:", e)
+
+def seen_writer_loop():
+    while True:
+        time.sleep(SEEN_FLUSH_INTERVAL)
+        flush_pending()
+
+def save_seen_snapshot():
+    # write the filter atomically, then drop the journal it now covers
+    global _inserts_since_snapshot
+    # reset up front: after a failure, retry on the next full interval rather than on every insert
+    _inserts_since_snapshot = 0
+    try:
+        tmp = SEEN_BLOOM_FILE + ".tmp"
+        with _seen_lock, open(tmp, "wb") as f:
+            seen_bloom.tofile(f)
+        with _seen_file_lock:
+            os.replace(tmp, SEEN_BLOOM_FILE)
+            open(SEEN_FILE, "wb").close()
+        return True
+    except Exception as e:
+        print("Could not write seen.bloom:", e)
+        return False
+
+def mark_seen(h: str):
+    # called once the notification is delivered (or given up on), never earlier:
+    # anything still queued at shutdown stays unseen and is notified again next start
+    global _inserts_since_snapshot
+    with _seen_lock:
+        seen_bloom.add(h)
+        _pending_hashes.append(h)
+        _inserts_since_snapshot += 1
+        if _inserts_since_snapshot >= SEEN_SNAPSHOT_EVERY:
+            save_seen_snapshot()
+    _inflight.discard(h)
+
+atexit.register(save_seen_snapshot)
+atexit.register(flush_pending)
 
 # ---------- User-Agent rotation (simple anti-ban) ----------
 USER_AGENTS = [
@@ -85,6 +216,18 @@ USER_AGENTS = [
     "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X)",
     "Mozilla/5.0 (Android 10; Mobile)"
 ]
+# pre-shuffled endless rotation: next() is a pointer bump instead of an RNG call per request
+_ua_iter = itertools.cycle(random.sample(USER_AGENTS * 8, len(USER_AGENTS) * 8))
+
+# ---------- Shared HTTP session (keep-alive connection pooling) ----------
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": USER_AGENTS[0]})
+_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+)
+SESSION.mount("https://", _adapter)
 
 # ---------- Final search list (brand/category/price) ----------
 SEARCHES = [
@@ -127,6 +270,10 @@ def build_url(brand: str, category: str, price: int) -> str:
 
 API_URLS = [build_url(s["brand"], s["category"], s["price"]) for s in SEARCHES]
 
+# hoist the per-search notification label out of the per-item path
+for s in SEARCHES:
+    s["_label"] = f"{s['brand']} - {s['category']}"
+
 # ---------- Helper: extract best photo url robustly ----------
 def extract_photo_url(item: dict) -> Optional[str]:
     # Try multiple common locations
@@ -155,63 +302,133 @@ def extract_photo_url(item: dict) -> Optional[str]:
 
 # ---------- Helper: compute a stable hash for item to avoid duplicates ----------
 def item_hash(item: dict) -> str:
-    try:
-        id_ = str(item.get("id", ""))
-        title = item.get("title", "") or ""
-        price = str(item.get("price", "") or "")
-        return str(abs(hash((id_, title, price))))
-    except Exception:
-        return str(time.time())
+    # blake2b is stable across restarts, unlike the per-process randomized hash()
+    # Vinted ids are unique on their own; only items without one fall back to their content
+    pid = _first(item, _ID_KEYS, None)
+    if pid:
+        key = str(pid).encode()
+    else:
+        key = f'\x1f{item.get("title", "")}\x1f{item.get("price", "")}'.encode()
+    # hex str, since pybloom_live hashes str keys directly but repr()s anything else;
+    # the journal stores it as SEEN_RECORD_SIZE raw bytes
+    return hashlib.blake2b(key, digest_size=SEEN_RECORD_SIZE).hexdigest()
 
 # ---------- Telegram send helper ----------
-def send_telegram_message(text: str, photo_url: Optional[str] = None):
+SEND_PHOTO_URL = f"https://api.telegram.org/bot{BOT_TOKEN}/sendPhoto"
+SEND_MSG_URL = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
+
+def send_telegram_message(text: str, photo_url: Optional[str] = None) -> Optional[float]:
+    # returns None when done, or the seconds to wait before retrying the same message
     try:
         if photo_url:
-            endpoint = f"https://api.telegram.org/bot{BOT_TOKEN}/sendPhoto"
-            requests.get(endpoint, params={"chat_id": CHAT_ID, "photo": photo_url, "caption": text}, timeout=15)
+            resp = SESSION.post(SEND_PHOTO_URL, data={"chat_id": CHAT_ID, "photo": photo_url, "caption": text}, timeout=15)
         else:
-            endpoint = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-            requests.get(endpoint, params={"chat_id": CHAT_ID, "text": text}, timeout=15)
+            resp = SESSION.post(SEND_MSG_URL, data={"chat_id": CHAT_ID, "text": text}, timeout=15)
     except Exception as e:
         print("Telegram send error:", e)
+        return TELEGRAM_RETRY_DELAY
+    if resp.status_code == 429:
+        try:
+            return float(resp.json()["parameters"]["retry_after"])
+        except Exception:
+            return TELEGRAM_RETRY_DELAY
+    if resp.status_code >= 500:
+        print("Telegram server error:", resp.status_code)
+        return TELEGRAM_RETRY_DELAY
+    if resp.status_code != 200:
+        print("Telegram rejected message:", resp.status_code, resp.text)
+    return None
+
+# ---------- Telegram sender worker (rate limited) ----------
+TELEGRAM_RATE = 1  # messages/sec, Telegram's limit for a single chat
+TELEGRAM_BURST = 3
+TELEGRAM_RETRY_DELAY = 5  # seconds, when Telegram gives no retry_after
+TELEGRAM_MAX_ATTEMPTS = 10
+notif_q = queue.Queue(maxsize=1000)
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+ratelimit = TokenBucket(TELEGRAM_RATE, TELEGRAM_BURST)
+
+def telegram_worker():
+    while True:
+        h, text, photo_url = notif_q.get()
+        try:
+            # single worker, retrying in place: a 429 holds back every send to the chat,
+            # messages keep their order, and a retry can't block on a full queue
+            for _ in range(TELEGRAM_MAX_ATTEMPTS):
+                ratelimit.acquire()
+                retry_after = send_telegram_message(text, photo_url)
+                if retry_after is None:
+                    break
+                time.sleep(retry_after)
+            else:
+                print("Giving up on Telegram message after retries:", text.splitlines()[1])
+            mark_seen(h)
+        finally:
+            notif_q.task_done()
+
+# ---------- Helper: first truthy field among fallback keys ----------
+_TITLE_KEYS = ("title", "description")
+_PRICE_KEYS = ("price", "price_amount")
+_PRICE_VALUE_KEYS = ("amount", "value", "raw")
+_SIZE_KEYS = ("size_title", "sizes")
+_CONDITION_KEYS = ("condition_title", "condition")
+_ID_KEYS = ("id", "item_id")
+_LINK_KEYS = ("url", "permalink")
+
+def _first(item: dict, keys: tuple, default):
+    return next((item[k] for k in keys if item.get(k)), default)
 
 # ---------- Process a single item: notify and save ----------
 def process_item(item: dict, search_spec: dict):
     try:
+        # dedupe first: most polled items are already seen, skip all field extraction for them
         h = item_hash(item)
-        if h in seen_hashes:
+        if h in seen_bloom or h in _inflight:
             return False
-        # add to seen and persist
-        seen_hashes.add(h)
-        try:
-            with open(SEEN_FILE, "a", encoding="utf-8") as f:
-                f.write(h + "\n")
-        except Exception as e:
-            print("Could not write seen file:", e)
 
-        title = item.get("title") or item.get("description") or "Senza titolo"
-        price = item.get("price") or item.get("price_amount") or "N/A"
+        title = _first(item, _TITLE_KEYS, "Senza titolo")
+        price = _first(item, _PRICE_KEYS, "N/A")
         # Some endpoints store price as dict
         if isinstance(price, dict):
-            price = price.get("amount") or price.get("value") or price.get("raw") or "N/A"
+            price = _first(price, _PRICE_VALUE_KEYS, "N/A")
         try:
             price_val = float(price)
             price_str = f"{price_val:.2f}"
         except Exception:
             price_str = str(price)
 
-        sizes = item.get("size_title") or item.get("sizes") or "N/A"
+        sizes = _first(item, _SIZE_KEYS, "N/A")
         if isinstance(sizes, list):
             sizes = ", ".join(sizes)
-        condition = item.get("condition_title") or item.get("condition") or "N/A"
-        pid = item.get("id") or item.get("item_id") or ""
-        link = f"https://www.vinted.it/items/{pid}" if pid else item.get("url") or item.get("permalink") or "N/A"
+        condition = _first(item, _CONDITION_KEYS, "N/A")
+        pid = _first(item, _ID_KEYS, "")
+        link = f"https://www.vinted.it/items/{pid}" if pid else _first(item, _LINK_KEYS, "N/A")
         photo_url = extract_photo_url(item)
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         text = (
             f"🔥 NUOVA OFFERTA!\n"
-            f"{search_spec['brand']} - {search_spec['category']}\n"
+            f"{search_spec['_label']}\n"
             f"💶 Prezzo: {price_str}€\n"
             f"📌 {title}\n"
             f"🎽 Taglia: {sizes}\n"
@@ -220,27 +437,27 @@ def process_item(item: dict, search_spec: dict):
             f"🔗 {link}"
         )
 
-        # send to telegram (all photos will be sent in sequence if available)
-        if photo_url:
-            send_telegram_message(text, photo_url)
-        else:
-            send_telegram_message(text)
+        # hand off to the telegram sender worker (blocks only while the queue is full);
+        # the worker marks the item seen once it is delivered
+        _inflight.add(h)
+        notif_q.put((h, text, photo_url))
 
         # write to Google Sheets if configured
         if sheet:
-            try:
-                sheet["trovati"].append_row([pid, search_spec['brand'], search_spec['category'],
-                                            price_str, title, sizes, condition, link, timestamp, "Trovato"])
-            except Exception as e:
-                print("Error writing to sheet:", e)
+            SHEET_QUEUES["trovati"].put([pid, search_spec['brand'], search_spec['category'],
+                                         price_str, title, sizes, condition, link, timestamp, "Trovato"])
 
         # update recent items for dashboard
         rec = {"id": pid, "brand": search_spec['brand'], "category": search_spec['category'],
                "price": price_str, "title": title, "sizes": sizes, "condition": condition,
                "link": link, "timestamp": timestamp, "state": "Trovato"}
-        recent_items.insert(0, rec)
-        if len(recent_items) > MAX_RECENT:
-            recent_items.pop()
+        if len(recent_items) == MAX_RECENT:
+            # appendleft below evicts the oldest record
+            popped = recent_items[-1]
+            if recent_by_id.get(str(popped["id"])) is popped:
+                recent_by_id.pop(str(popped["id"]), None)
+        recent_items.appendleft(rec)
+        recent_by_id[str(pid)] = rec
 
         print("Notified:", title)
         return True
@@ -248,73 +465,151 @@ def process_item(item: dict, search_spec: dict):
         print("process_item error:", e)
         return False
 
-# ---------- Scraper loop ----------
-def scraper_loop():
-    print("Scraper started: checking every 15 seconds.")
-    while True:
-        for spec, url in zip(SEARCHES, API_URLS):
+# ---------- Scraper loop (async fan-out over all searches) ----------
+MAX_CONCURRENT_REQUESTS = 10  # keep Vinted from rate limiting us
+_cond_cache = {}  # url -> {"etag", "last_modified"} validators from the last 200
+POLL_BASE_DELAY = 15  # seconds between polls of a search that keeps finding items
+POLL_MAX_DELAY = 240  # ceiling for searches that keep coming back empty
+poll_state = {url: {"next_due": 0, "empty_streak": 0} for url in API_URLS}
+
+def extract_items(data) -> list:
+    if not isinstance(data, dict):
+        return []
+    # "items" is the usual container; try alternatives too
+    items = data.get("items") or data.get("data") or []
+    # if nested structure
+    if isinstance(items, dict) and "items" in items:
+        items = items.get("items", [])
+    return items or []
+
+async def fetch(client: httpx.AsyncClient, spec: dict, url: str, sem: asyncio.Semaphore):
+    async with sem:
+        try:
+            headers = {"User-Agent": next(_ua_iter)}
+            cached = _cond_cache.get(url, {})
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+            resp = await client.get(url, headers=headers)
+            # nothing new since the last poll: empty body, nothing to parse
+            if resp.status_code == 304:
+                return spec, None
+            # don't bother parsing error pages (rate limits, blocks, HTML)
+            if resp.status_code != 200 or "json" not in resp.headers.get("Content-Type", ""):
+                print("Bad response from Vinted:", resp.status_code, url)
+                return spec, None
+            # Try to parse JSON; if not JSON skip
             try:
-                headers = {"User-Agent": random.choice(USER_AGENTS)}
-                resp = requests.get(url, headers=headers, timeout=20)
-                # Try to parse JSON; if not JSON skip
-                try:
-                    data = resp.json()
-                except Exception:
-                    print("Non-JSON response from Vinted for URL:", url)
-                    continue
-
-                # "items" is the usual container; try alternatives too
-                items = data.get("items") or data.get("data") or []
-                # if nested structure
-                if isinstance(items, dict) and "items" in items:
-                    items = items.get("items", [])
-
-                if not items:
-                    # no results
-                    continue
-
-                for it in items:
+                data = orjson.loads(resp.content)
+            except Exception:
+                print("Non-JSON response from Vinted for URL:", url)
+                return spec, None
+            # only remember validators for a page we actually got to process
+            _cond_cache[url] = {"etag": resp.headers.get("ETag"),
+                                "last_modified": resp.headers.get("Last-Modified")}
+            return spec, data
+        except Exception as e:
+            print("Request error:", e)
+            return spec, None
+
+async def scraper_loop_async():
+    print(f"Scraper started: checking every {POLL_BASE_DELAY}-{POLL_MAX_DELAY} seconds per search.")
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    # HTTP/2 multiplexes every search over a single connection to www.vinted.it
+    limits = httpx.Limits(max_connections=4, keepalive_expiry=60)
+    async with httpx.AsyncClient(http2=True, timeout=20, limits=limits) as client:
+        while True:
+            now = time.monotonic()
+            due = [(s, u) for s, u in zip(SEARCHES, API_URLS) if now >= poll_state[u]["next_due"]]
+            results = await asyncio.gather(*[fetch(client, s, u, sem) for s, u in due])
+            now = time.monotonic()
+            for (_, url), (spec, data) in zip(due, results):
+                hits = 0
+                for it in extract_items(data):
                     # sometimes item is nested under 'item' key
                     if isinstance(it, dict) and 'item' in it and isinstance(it['item'], dict):
                         candidate = it['item']
                     else:
                         candidate = it
                     try:
-                        process_item(candidate, spec)
+                        if process_item(candidate, spec):
+                            hits += 1
                     except Exception as e:
                         print("Error processing candidate:", e)
-            except Exception as e:
-                print("Request error:", e)
-        # fixed wait 15 seconds as requested
-        time.sleep(15)
+                # back off exponentially on quiet searches, snap back on any new hit
+                state = poll_state[url]
+                if hits:
+                    state["empty_streak"] = 0
+                    delay = POLL_BASE_DELAY
+                else:
+                    state["empty_streak"] += 1
+                    delay = min(POLL_MAX_DELAY, POLL_BASE_DELAY * 2 ** min(4, state["empty_streak"]))
+                state["next_due"] = now + delay
+            await asyncio.sleep(POLL_BASE_DELAY)
 
 # ---------- Flask dashboard ----------
+class OrjsonProvider(JSONProvider):
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+DASH_CACHE_TTL = 5  # seconds a serialized dashboard body is reused
+_dash_cache = {}  # route -> {"ts", "body", "etag"}
+
+def cached_json(key: str, build):
+    # serialize at most once per TTL and let clients revalidate with If-None-Match
+    now = time.time()
+    entry = _dash_cache.get(key)
+    if not entry or now - entry["ts"] >= DASH_CACHE_TTL:
+        body = orjson.dumps(build())
+        entry = {"ts": now, "body": body, "etag": hashlib.md5(body).hexdigest()}
+        _dash_cache[key] = entry
+    resp = Response(entry["body"], mimetype="application/json")
+    resp.set_etag(entry["etag"])
+    resp.headers["Cache-Control"] = f"public, max-age={DASH_CACHE_TTL}"
+    return resp.make_conditional(request)
 
 @app.route("/")
 def index():
-    return jsonify({
+    return cached_json("index", lambda: {
         "status": "ok",
-        "tracked_total": len(seen_hashes),
+        "tracked_total": len(seen_bloom),
         "recent_count": len(recent_items),
-        "recent": recent_items[:50]
+        "recent": list(itertools.islice(recent_items, 50))
     })
 
 @app.route("/health")
 def health():
-    return jsonify({"status": "up", "time": datetime.now().isoformat()})
+    return cached_json("health", lambda: {"status": "up", "time": datetime.now().isoformat()})
 
 @app.route("/item/<item_id>")
 def get_item(item_id):
-    for r in recent_items:
-        if str(r.get("id")) == str(item_id):
-            return jsonify(r)
+    rec = recent_by_id.get(str(item_id))
+    if rec:
+        return jsonify(rec)
     return jsonify({"error": "not found"}), 404
 
 # ---------- Start scraper in background and run Flask ----------
 if __name__ == "__main__":
+    # Railway stops the container with SIGTERM, which skips atexit; turn it into a normal
+    # exit in the main thread so the sheet and seen-journal flushes still run
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    # start seen-journal writer thread
+    threading.Thread(target=seen_writer_loop, daemon=True).start()
+    # start telegram sender worker (one chat, so one sender)
+    threading.Thread(target=telegram_worker, daemon=True).start()
+    # start one Google Sheets writer thread per worksheet
+    if sheet:
+        for name in SHEET_QUEUES:
+            threading.Thread(target=sheet_writer_loop, args=(name,), daemon=True).start()
     # start scraper thread
-    t = threading.Thread(target=scraper_loop, daemon=True)
+    t = threading.Thread(target=lambda: asyncio.run(scraper_loop_async()), daemon=True)
     t.start()
-    # run flask (Railway will expose this)
-    app.run(host="0.0.0.0", port=PORT)
\ No newline at end of file
+    # serve flask with a threaded production server (Railway will expose this)
+    serve(app, host="0.0.0.0", port=PORT, threads=8, connection_limit=100, channel_timeout=30)
\ No newline at end of file